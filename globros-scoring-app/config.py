@@ -24,6 +24,16 @@ SCORE_RANGES = {
     "ImpossiBordle": None  # Special handling
 }
 
+# Raw scores at or above these thresholds get the "bad score" treatment.
+# Games without an entry never trigger it.
+BAD_SCORE_THRESHOLDS = {
+    "Worldle": 10,
+    "Globle": 10,
+    "Countryle": 10,
+    "Travle": 3,
+    "Geogrid": 200
+}
+
 # Celebration messages and GIFs
 CELEBRATION_MESSAGES = [
     "🎉 Congratulations! You're the Geography Champion! 🎉",
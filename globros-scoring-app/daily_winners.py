@@ -1,12 +1,32 @@
+import csv
+import numpy as np
 import pandas as pd
 import os
 from datetime import datetime
 from config import PLAYERS
+from data_manager import DEBUG, _read_csv_cached
 
 # Daily placements CSV path
 PLACEMENTS_CSV_PATH = "data/daily_placements.csv"
 PLACEMENTS_COLUMNS = ["date", "player", "placement", "total_score", "participants"]
 
+def _participation_mask(raw_scores):
+    """
+    Boolean mask (one entry per player) of who submitted at least one
+    score, computed as a single reduction over the stacked score lists.
+
+    Args:
+        raw_scores (dict): Game name -> per-player score list (None for
+                           non-participants)
+
+    Returns:
+        np.ndarray: Length len(PLAYERS) boolean array
+    """
+    if not raw_scores:
+        return np.zeros(len(PLAYERS), dtype=bool)
+    stacked = np.array(list(raw_scores.values()), dtype=object)
+    return (stacked != None).any(axis=0)  # noqa: E711 - elementwise compare
+
 def ensure_placements_csv_exists():
     """
     Create the daily placements CSV file with headers if it doesn't exist.
@@ -19,8 +39,9 @@ def ensure_placements_csv_exists():
         # Create empty DataFrame with proper columns
         df = pd.DataFrame(columns=PLACEMENTS_COLUMNS)
         df.to_csv(PLACEMENTS_CSV_PATH, index=False)
-        print(f"Created empty placements CSV file: {PLACEMENTS_CSV_PATH}")
-    else:
+        if DEBUG:
+            print(f"Created empty placements CSV file: {PLACEMENTS_CSV_PATH}")
+    elif DEBUG:
         print(f"Placements CSV file already exists: {PLACEMENTS_CSV_PATH}")
 
 def save_daily_placements(date, results):
@@ -37,53 +58,50 @@ def save_daily_placements(date, results):
     try:
         ensure_placements_csv_exists()
         
-        # Get participating players with their scores
-        participating_players = []
-        player_scores = []
-        for i, player in enumerate(PLAYERS):
-            participated = any(
-                results["raw_scores"][game][i] is not None 
-                for game in results["raw_scores"]
-            )
-            if participated:
-                participating_players.append(player)
-                player_scores.append((player, results["total_scores"][i]))
-        
-        # Sort by total score (lower is better)
-        player_scores.sort(key=lambda x: x[1])
-        
-        # Create placement data with proper tie handling
-        rows = []
-        current_rank = 1
-        prev_score = None
+        # Single vectorized reduction over the stacked score lists
+        participated = _participation_mask(results["raw_scores"])
+        participating_players = [PLAYERS[i] for i in np.flatnonzero(participated)]
+        player_scores = [
+            (PLAYERS[i], results["total_scores"][i])
+            for i in np.flatnonzero(participated)
+        ]
         
-        for i, (player, score) in enumerate(player_scores):
-            # If this score is different from previous, update rank
-            if prev_score is not None and score != prev_score:
-                current_rank = i + 1
-            
-            rows.append({
+        # Rank with pandas; method="min" gives tied scores the same
+        # placement, matching the old manual running-rank loop
+        totals = pd.Series(dict(player_scores))
+        placements = totals.rank(method="min").astype(int)
+        participants = ",".join(participating_players)
+
+        rows = [
+            {
                 "date": date,
                 "player": player,
-                "placement": current_rank,
-                "total_score": score,
-                "participants": ",".join(participating_players)
-            })
-            prev_score = score
-        
-        # Convert to DataFrame
-        new_data = pd.DataFrame(rows)
-        
-        # Read existing data
-        existing_data = pd.read_csv(PLACEMENTS_CSV_PATH)
-        
-        # Remove any existing data for this date (in case of updates)
-        existing_data = existing_data[existing_data["date"] != date]
-        
-        # Combine and save
-        combined_data = pd.concat([existing_data, new_data], ignore_index=True)
-        combined_data.to_csv(PLACEMENTS_CSV_PATH, index=False)
+                "placement": int(placements[player]),
+                "total_score": float(totals[player]),
+                "participants": participants
+            }
+            for player in totals.sort_values(kind="stable").index
+        ]
         
+        existing_data = _read_csv_cached(PLACEMENTS_CSV_PATH)
+
+        if date in existing_data["date"].values:
+            # Updating an existing date: rewrite the file without the old rows
+            new_data = pd.DataFrame(rows)
+            existing_data = existing_data[existing_data["date"] != date]
+            combined_data = pd.concat([existing_data, new_data], ignore_index=True)
+            combined_data = combined_data.reset_index(drop=True)
+            # Write to a sibling temp file and rename into place so a
+            # crash mid-rewrite can't corrupt the history
+            tmp_path = PLACEMENTS_CSV_PATH + ".tmp"
+            combined_data.to_csv(tmp_path, index=False,
+                                 columns=PLACEMENTS_COLUMNS, lineterminator="\n")
+            os.replace(tmp_path, PLACEMENTS_CSV_PATH)
+        else:
+            # Common case (new date): append only the new rows
+            with open(PLACEMENTS_CSV_PATH, "a", newline="") as f:
+                csv.DictWriter(f, fieldnames=PLACEMENTS_COLUMNS).writerows(rows)
+
         return True
     
     except Exception as e:
@@ -106,13 +124,15 @@ def load_daily_placements():
     """
     try:
         if os.path.exists(PLACEMENTS_CSV_PATH):
-            df = pd.read_csv(PLACEMENTS_CSV_PATH)
-            print(f"Loaded placements CSV with {len(df)} rows from {PLACEMENTS_CSV_PATH}")
-            if len(df) > 0:
-                print(f"Placements data: {df.head()}")
+            df = _read_csv_cached(PLACEMENTS_CSV_PATH)
+            if DEBUG:
+                print(f"Loaded placements CSV with {len(df)} rows from {PLACEMENTS_CSV_PATH}")
+                if len(df) > 0:
+                    print(f"Placements data: {df.head()}")
             return df
         else:
-            print(f"Placements CSV file does not exist: {PLACEMENTS_CSV_PATH}")
+            if DEBUG:
+                print(f"Placements CSV file does not exist: {PLACEMENTS_CSV_PATH}")
             ensure_placements_csv_exists()
             return pd.DataFrame(columns=PLACEMENTS_COLUMNS)
     except Exception as e:
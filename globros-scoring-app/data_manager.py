@@ -1,8 +1,101 @@
+import csv
 import pandas as pd
 import os
 from datetime import datetime
 from config import CSV_FILE_PATH, CSV_COLUMNS, PLAYERS, GAMES
 
+# Informational load/save chatter is opt-in; errors always print
+DEBUG = bool(os.environ.get("GLOBROS_DEBUG"))
+
+# Explicit dtypes so read_csv skips its type-inference pass. game and
+# player are tiny fixed vocabularies, so category codes also shrink the
+# frame and speed up downstream groupbys.
+CSV_DTYPES = {
+    "date": str,
+    "game": "category",
+    "player": "category",
+    "raw_score": "float64",
+    "normalized_unweighted_score": "float64",
+    "normalized_weighted_score": "float64",
+}
+
+# Parquet mirror of the scores CSV. The CSV stays the canonical store
+# (it's what the GitHub sync and the raw.githubusercontent.com consumers
+# expect), but parquet is much faster to parse, so cold loads prefer the
+# mirror whenever it's at least as new as the CSV.
+PARQUET_MIRROR_PATH = CSV_FILE_PATH.replace(".csv", ".parquet")
+
+# In-process cache of parsed CSVs keyed by file mtime, so repeated loads
+# within a session skip re-parsing until the file changes on disk.
+_DF_CACHE = {}
+
+def _refresh_parquet_mirror(df, csv_mtime):
+    """
+    Write the parquet mirror for an already-parsed scores DataFrame and
+    stamp it with the CSV's mtime so freshness checks stay simple.
+    """
+    try:
+        df.to_parquet(PARQUET_MIRROR_PATH, engine="pyarrow", compression="zstd")
+        os.utime(PARQUET_MIRROR_PATH, (csv_mtime, csv_mtime))
+    except Exception as e:
+        # The mirror is purely an optimization; never fail a load over it
+        print(f"Could not refresh parquet mirror: {e}")
+
+def _read_csv_cached(path):
+    """
+    Read a CSV into a DataFrame, reusing the cached parse when the file
+    hasn't been modified since the last read.
+
+    Args:
+        path (str): Path to the CSV file
+
+    Returns:
+        pd.DataFrame: Parsed data
+    """
+    mtime = os.path.getmtime(path)
+    cached = _DF_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    df = None
+    if path == CSV_FILE_PATH:
+        # Cold load: prefer the parquet mirror when it matches the CSV
+        try:
+            if (os.path.exists(PARQUET_MIRROR_PATH)
+                    and os.path.getmtime(PARQUET_MIRROR_PATH) >= mtime):
+                df = pd.read_parquet(PARQUET_MIRROR_PATH, engine="pyarrow")
+        except Exception as e:
+            print(f"Could not read parquet mirror, falling back to CSV: {e}")
+            df = None
+    if df is None:
+        dtypes = CSV_DTYPES if path == CSV_FILE_PATH else None
+        df = pd.read_csv(path, dtype=dtypes, engine="c")
+        if path == CSV_FILE_PATH:
+            _refresh_parquet_mirror(df, mtime)
+    _DF_CACHE[path] = (mtime, df)
+    return df
+
+def _store_parsed(df):
+    """
+    Install a freshly-saved scores frame as the cached parse and refresh
+    the parquet mirror, so a save never forces its own data to be
+    re-read from the CSV.
+    """
+    mtime = os.path.getmtime(CSV_FILE_PATH)
+    df = df.astype(CSV_DTYPES)
+    _DF_CACHE[CSV_FILE_PATH] = (mtime, df)
+    _refresh_parquet_mirror(df, mtime)
+
+def _append_rows(path, rows):
+    """
+    Append pre-built rows to an existing CSV file without rewriting it.
+
+    Args:
+        path (str): Path to the CSV file
+        rows (list): List of row tuples matching the file's columns
+    """
+    with open(path, "a", newline="") as f:
+        csv.writer(f).writerows(rows)
+
 def ensure_csv_exists():
     """
     Create the CSV file with headers if it doesn't exist.
@@ -15,8 +108,9 @@ def ensure_csv_exists():
         # Create empty DataFrame with proper columns
         df = pd.DataFrame(columns=CSV_COLUMNS)
         df.to_csv(CSV_FILE_PATH, index=False)
-        print(f"Created empty CSV file: {CSV_FILE_PATH}")
-    else:
+        if DEBUG:
+            print(f"Created empty CSV file: {CSV_FILE_PATH}")
+    elif DEBUG:
         print(f"CSV file already exists: {CSV_FILE_PATH}")
 
 def save_daily_results(date, results):
@@ -33,40 +127,58 @@ def save_daily_results(date, results):
     try:
         ensure_csv_exists()
         
-        # Prepare data for CSV
-        rows = []
-        
+        # Build one list per column instead of per-row dicts; pandas (and
+        # csv.writer) consume these without any per-row schema inference.
+        # None values pass through as empty CSV cells / NaN either way.
+        games = []
+        players = []
+        raw = []
+        norm_unweighted = []
+        norm_weighted = []
         for game in GAMES.keys():
             if game in results["raw_scores"]:
-                for i, player in enumerate(PLAYERS):
-                    # Handle None values properly for CSV storage
-                    raw_score = results["raw_scores"][game][i]
-                    norm_unweighted = results["normalized_unweighted"][game][i]
-                    norm_weighted = results["normalized_weighted"][game][i]
-                    
-                    row = {
-                        "date": date,
-                        "game": game,
-                        "player": player,
-                        "raw_score": raw_score if raw_score is not None else "",
-                        "normalized_unweighted_score": norm_unweighted if norm_unweighted is not None else "",
-                        "normalized_weighted_score": norm_weighted if norm_weighted is not None else ""
-                    }
-                    rows.append(row)
-        
-        # Convert to DataFrame
-        new_data = pd.DataFrame(rows)
-        
-        # Read existing data
-        existing_data = pd.read_csv(CSV_FILE_PATH)
-        
-        # Remove any existing data for this date (in case of updates)
-        existing_data = existing_data[existing_data["date"] != date]
-        
-        # Combine and save
-        combined_data = pd.concat([existing_data, new_data], ignore_index=True)
-        combined_data.to_csv(CSV_FILE_PATH, index=False)
-        
+                games.extend([game] * len(PLAYERS))
+                players.extend(PLAYERS)
+                raw.extend(results["raw_scores"][game])
+                norm_unweighted.extend(results["normalized_unweighted"][game])
+                norm_weighted.extend(results["normalized_weighted"][game])
+        dates = [date] * len(games)
+
+        new_rows = zip(dates, games, players, raw, norm_unweighted, norm_weighted)
+        new_data = pd.DataFrame({
+            "date": dates,
+            "game": games,
+            "player": players,
+            "raw_score": raw,
+            "normalized_unweighted_score": norm_unweighted,
+            "normalized_weighted_score": norm_weighted
+        }, columns=CSV_COLUMNS)
+
+        existing_data = _read_csv_cached(CSV_FILE_PATH)
+
+        if check_date_exists(date):
+            # Updating an existing date: rewrite the file without the old
+            # rows. csv.writer skips pandas' per-cell format dispatch, so
+            # the rewrite runs at raw I/O speed for this simple schema.
+            existing_data = existing_data[existing_data["date"] != date]
+            out = existing_data.astype(object).fillna("")
+            # Write to a sibling temp file and rename into place so a
+            # crash mid-rewrite can't corrupt the history
+            tmp_path = CSV_FILE_PATH + ".tmp"
+            with open(tmp_path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(CSV_COLUMNS)
+                writer.writerows(out.itertuples(index=False, name=None))
+                writer.writerows(new_rows)
+            os.replace(tmp_path, CSV_FILE_PATH)
+        else:
+            # Common case (new date): append only the new rows
+            _append_rows(CSV_FILE_PATH, new_rows)
+
+        # Either way we now hold the merged history in memory; keep the
+        # cache and the parquet mirror current so the next load is free
+        _store_parsed(pd.concat([existing_data, new_data], ignore_index=True))
+
         return True
     
     except Exception as e:
@@ -85,13 +197,15 @@ def load_historical_data():
     try:
         # Don't call ensure_csv_exists() - let it read existing files first
         if os.path.exists(CSV_FILE_PATH):
-            df = pd.read_csv(CSV_FILE_PATH)
-            print(f"Loaded CSV with {len(df)} rows from {CSV_FILE_PATH}")
-            if len(df) > 0:
-                print(f"First few rows: {df.head()}")
+            df = _read_csv_cached(CSV_FILE_PATH)
+            if DEBUG:
+                print(f"Loaded CSV with {len(df)} rows from {CSV_FILE_PATH}")
+                if len(df) > 0:
+                    print(f"First few rows: {df.head()}")
             return df
         else:
-            print(f"CSV file does not exist: {CSV_FILE_PATH}")
+            if DEBUG:
+                print(f"CSV file does not exist: {CSV_FILE_PATH}")
             ensure_csv_exists()
             return pd.DataFrame(columns=CSV_COLUMNS)
     except Exception as e:
@@ -100,10 +214,28 @@ def load_historical_data():
         traceback.print_exc()
         return pd.DataFrame(columns=CSV_COLUMNS)
 
+def _winners_from_totals(daily_totals):
+    """
+    Derive each date's winner from per-(date, player) total scores.
+
+    Args:
+        daily_totals (pd.DataFrame): Columns date, player and
+                                     normalized_weighted_score
+
+    Returns:
+        pd.DataFrame: DataFrame with date and winner columns
+    """
+    # Pivot to a date x player matrix of total scores, then take the
+    # per-date minimum in one vectorized pass (lowest total wins)
+    totals = daily_totals.pivot(
+        index="date", columns="player", values="normalized_weighted_score")
+    winners = totals.idxmin(axis=1).rename("winner").reset_index()
+    return winners.sort_values("date")
+
 def get_daily_winners():
     """
     Get list of daily winners from historical data.
-    
+
     Returns:
         pd.DataFrame: DataFrame with date and winner columns
     """
@@ -111,15 +243,9 @@ def get_daily_winners():
         df = load_historical_data()
         if df.empty:
             return pd.DataFrame(columns=["date", "winner"])
-        
-        # Group by date and calculate total scores for each player
-        daily_totals = df.groupby(["date", "player"])["normalized_weighted_score"].sum().reset_index()
-        
-        # Find winner for each date (lowest total score)
-        winners = daily_totals.loc[daily_totals.groupby("date")["normalized_weighted_score"].idxmin()]
-        winners = winners[["date", "player"]].rename(columns={"player": "winner"})
-        
-        return winners.sort_values("date")
+
+        daily_totals = df.groupby(["date", "player"], observed=True)["normalized_weighted_score"].sum().reset_index()
+        return _winners_from_totals(daily_totals)
     
     except Exception as e:
         print(f"Error getting daily winners: {e}")
@@ -136,26 +262,31 @@ def get_player_statistics():
         df = load_historical_data()
         if df.empty:
             return {}
-        
-        winners_df = get_daily_winners()
-        
+
+        # Compute per-(date, player) totals once; they feed both the
+        # winners derivation and the performance trends below.
+        # observed=True keeps categorical groupers from emitting empty
+        # (date, player) combinations.
+        daily_totals = df.groupby(["date", "player"], observed=True)["normalized_weighted_score"].sum().reset_index()
+        winners_df = _winners_from_totals(daily_totals)
+
         stats = {
-            "total_games_played": len(df["date"].unique()),
+            "total_games_played": df["date"].nunique(),
             "win_counts": winners_df["winner"].value_counts().to_dict(),
             "average_scores_by_game": {},
             "player_performance_trends": {},
             "game_difficulty_analysis": {}
         }
         
-        # Average scores by game and player
-        for game in GAMES.keys():
-            game_data = df[df["game"] == game]
-            if not game_data.empty:
-                avg_scores = game_data.groupby("player")["raw_score"].mean().to_dict()
-                stats["average_scores_by_game"][game] = avg_scores
+        # Average scores by game and player - one grouped pass instead of
+        # a full-frame filter per game
+        avg_scores = df.groupby(["game", "player"], observed=True)["raw_score"].mean()
+        stats["average_scores_by_game"] = {
+            game: scores.droplevel("game").to_dict()
+            for game, scores in avg_scores.groupby(level="game", observed=True)
+        }
         
         # Player performance trends (total weighted scores over time)
-        daily_totals = df.groupby(["date", "player"])["normalized_weighted_score"].sum().reset_index()
         for player in PLAYERS:
             player_data = daily_totals[daily_totals["player"] == player].sort_values("date")
             stats["player_performance_trends"][player] = {
@@ -163,15 +294,17 @@ def get_player_statistics():
                 "scores": player_data["normalized_weighted_score"].tolist()
             }
         
-        # Game difficulty analysis (average raw scores)
-        for game in GAMES.keys():
-            game_data = df[df["game"] == game]
-            if not game_data.empty:
-                stats["game_difficulty_analysis"][game] = {
-                    "average_score": game_data["raw_score"].mean(),
-                    "median_score": game_data["raw_score"].median(),
-                    "std_dev": game_data["raw_score"].std()
-                }
+        # Game difficulty analysis (average raw scores) - likewise a
+        # single grouped aggregation
+        by_game = df.groupby("game", observed=True)["raw_score"].agg(["mean", "median", "std"])
+        stats["game_difficulty_analysis"] = {
+            game: {
+                "average_score": row["mean"],
+                "median_score": row["median"],
+                "std_dev": row["std"]
+            }
+            for game, row in by_game.iterrows()
+        }
         
         return stats
     
@@ -179,19 +312,28 @@ def get_player_statistics():
         print(f"Error calculating statistics: {e}")
         return {}
 
+# Set of dates present in the scores CSV, rebuilt only when the file
+# changes on disk so the existence check is a set lookup
+_DATES_SET = set()
+_DATES_MTIME = None
+
 def check_date_exists(date):
     """
     Check if data for a specific date already exists.
-    
+
     Args:
         date (str): Date in YYYY-MM-DD format
-    
+
     Returns:
         bool: True if data exists for this date
     """
+    global _DATES_SET, _DATES_MTIME
     try:
-        df = load_historical_data()
-        return date in df["date"].values
+        mtime = os.path.getmtime(CSV_FILE_PATH)
+        if mtime != _DATES_MTIME:
+            _DATES_SET = set(_read_csv_cached(CSV_FILE_PATH)["date"])
+            _DATES_MTIME = mtime
+        return date in _DATES_SET
     except:
         return False
 
@@ -208,8 +350,13 @@ def delete_date_data(date):
     try:
         ensure_csv_exists()
         df = pd.read_csv(CSV_FILE_PATH)
-        df = df[df["date"] != date]
-        df.to_csv(CSV_FILE_PATH, index=False)
+        # Strip the filtered index up front and write with an explicit
+        # column list and line terminator so to_csv stays on its fast path
+        df = df[df["date"] != date].reset_index(drop=True)
+        tmp_path = CSV_FILE_PATH + ".tmp"
+        df.to_csv(tmp_path, index=False, columns=CSV_COLUMNS,
+                  lineterminator="\n")
+        os.replace(tmp_path, CSV_FILE_PATH)
         return True
     except Exception as e:
         print(f"Error deleting data: {e}")
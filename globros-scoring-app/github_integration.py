@@ -1,8 +1,8 @@
 import streamlit as st
 import pandas as pd
-from github import Github
+from github import Github, InputGitTreeElement
 from datetime import datetime
-import io
+from operator import itemgetter
 
 # GitHub configuration
 REPO_NAME = "crbrandt/globros"
@@ -19,77 +19,40 @@ def get_github_token():
         # Fall back to hardcoded token
         return GITHUB_TOKEN
 
-def update_github_csv(file_path, new_data, commit_message):
+# Lazily-created repository handle, reused across saves so each update
+# doesn't redo the client setup and the GET /repos lookup (and keeps
+# reusing the same pooled TLS connections)
+_REPO = None
+
+def _get_repo():
+    """Return the memoized PyGithub repository handle."""
+    global _REPO
+    if _REPO is None:
+        _REPO = Github(get_github_token(), retry=3, pool_size=4).get_repo(REPO_NAME)
+    return _REPO
+
+def _push_files_single_commit(repo, files, commit_message):
     """
-    Update a CSV file in GitHub repository with new data.
-    
+    Commit several files to the default branch as one commit via the
+    Git Data API (tree + commit + ref update). A single ref update means
+    both CSVs land atomically and there is no non-fast-forward race
+    between parallel per-file Contents-API calls.
+
     Args:
-        file_path (str): Path to the CSV file in the repository
-        new_data (pd.DataFrame): New data to append
-        commit_message (str): Commit message for the update
-    
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    try:
-        github_token = get_github_token()
-        if not github_token or github_token == "your_github_token_here":
-            st.error("❌ GitHub token not configured. Please update GITHUB_TOKEN in github_integration.py")
-            return False
-        
-        st.info(f"🔄 Updating {file_path} with {len(new_data)} rows...")
-        
-        # Initialize GitHub client
-        g = Github(github_token)
-        repo = g.get_repo(REPO_NAME)
-
-        # Try to get existing content
-        try:
-            contents = repo.get_contents(file_path)
-            # Read existing CSV data
-            existing_csv = contents.decoded_content.decode('utf-8')
-            existing_data = pd.read_csv(io.StringIO(existing_csv))
-            
-            # Remove any existing data for the same date (to handle updates)
-            if 'date' in new_data.columns and 'date' in existing_data.columns:
-                dates_to_update = new_data['date'].unique()
-                existing_data = existing_data[~existing_data['date'].isin(dates_to_update)]
-            
-            # Append new data
-            updated_data = pd.concat([existing_data, new_data], ignore_index=True)
-            
-        except Exception as e:
-            # If file doesn't exist or can't be read, create new DataFrame
-            st.warning(f"Could not read existing file, creating new one: {e}")
-            updated_data = new_data
-
-        # Convert DataFrame to CSV string
-        csv_buffer = updated_data.to_csv(index=False)
-
-        # Update or create file on GitHub
-        if 'contents' in locals():
-            repo.update_file(
-                file_path,
-                commit_message,
-                csv_buffer,
-                contents.sha
-            )
-            st.success(f"✅ Successfully updated {file_path}")
-        else:
-            repo.create_file(
-                file_path,
-                commit_message,
-                csv_buffer
-            )
-            st.success(f"✅ Successfully created {file_path}")
-        
-        return True
+        repo: PyGithub repository handle
+        files (dict): Mapping of repository path to new file text
+        commit_message (str): Commit message
 
-    except Exception as e:
-        st.error(f"❌ Error updating GitHub: {str(e)}")
-        import traceback
-        st.error(f"Full error details: {traceback.format_exc()}")
-        return False
+    Raises on failure; the caller reports the error.
+    """
+    ref = repo.get_git_ref(f"heads/{repo.default_branch}")
+    base_commit = repo.get_git_commit(ref.object.sha)
+    tree = repo.create_git_tree(
+        [InputGitTreeElement(path, "100644", "blob", content)
+         for path, content in files.items()],
+        base_tree=base_commit.tree)
+    new_commit = repo.create_git_commit(commit_message, tree, [base_commit])
+    ref.edit(new_commit.sha)
 
 def save_results_to_github(date, results):
     """
@@ -102,8 +65,11 @@ def save_results_to_github(date, results):
     Returns:
         bool: True if both files updated successfully
     """
+    import numpy as np
     from config import GAMES, PLAYERS
-    
+    from data_manager import load_historical_data
+    from daily_winners import load_daily_placements, _participation_mask
+
     try:
         # Prepare scores data
         scores_rows = []
@@ -126,20 +92,19 @@ def save_results_to_github(date, results):
         
         scores_df = pd.DataFrame(scores_rows)
         
-        # Prepare placements data
-        participating_players = []
-        player_scores = []
-        for i, player in enumerate(PLAYERS):
-            participated = any(
-                results["raw_scores"][game][i] is not None 
-                for game in results["raw_scores"]
-            )
-            if participated:
-                participating_players.append(player)
-                player_scores.append((player, results["total_scores"][i]))
+        # Prepare placements data - participation comes from one
+        # vectorized reduction over the stacked score lists
+        participated = _participation_mask(results["raw_scores"])
+        participating_players = [PLAYERS[i] for i in np.flatnonzero(participated)]
+        player_scores = [
+            (PLAYERS[i], results["total_scores"][i])
+            for i in np.flatnonzero(participated)
+        ]
         
         # Sort by total score (lower is better)
-        player_scores.sort(key=lambda x: x[1])
+        # itemgetter runs the key extraction in C instead of a Python
+        # frame per comparison
+        player_scores.sort(key=itemgetter(1))
         
         # Create placement data with proper tie handling
         placements_rows = []
@@ -161,17 +126,46 @@ def save_results_to_github(date, results):
             prev_score = score
         
         placements_df = pd.DataFrame(placements_rows)
-        
-        # Update both files
+
+        # Merge the new rows into the local copies in-memory; the local CSVs
+        # mirror the repo files, so uploading the merged frames avoids
+        # downloading and re-parsing the remote history on every save.
+        local_scores = load_historical_data()
+        if not local_scores.empty:
+            scores_df = pd.concat(
+                [local_scores[local_scores["date"] != date], scores_df],
+                ignore_index=True)
+        local_placements = load_daily_placements()
+        if not local_placements.empty:
+            placements_df = pd.concat(
+                [local_placements[local_placements["date"] != date], placements_df],
+                ignore_index=True)
+
+        # Push both files as one Git Data API commit from this thread.
+        # Worker threads can't render Streamlit elements (no
+        # ScriptRunContext), and two parallel Contents-API updates race
+        # on the branch ref; one tree/commit/ref round-trip avoids both
         commit_message = f"Update Globros scores for {date}"
-        
-        success1 = update_github_csv(SCORES_FILE_PATH, scores_df, commit_message)
-        success2 = update_github_csv(PLACEMENTS_FILE_PATH, placements_df, commit_message)
-        
-        return success1 and success2
-        
+
+        github_token = get_github_token()
+        if not github_token or github_token == "your_github_token_here":
+            st.error("❌ GitHub token not configured. Please update GITHUB_TOKEN in github_integration.py")
+            return False
+
+        st.info(f"🔄 Updating {SCORES_FILE_PATH} and {PLACEMENTS_FILE_PATH}...")
+        _push_files_single_commit(
+            _get_repo(),
+            {SCORES_FILE_PATH: scores_df.to_csv(index=False),
+             PLACEMENTS_FILE_PATH: placements_df.to_csv(index=False)},
+            commit_message)
+        st.success(f"✅ Successfully updated scores and placements for {date}")
+
+        return True
+
     except Exception as e:
-        st.error(f"❌ Error preparing data for GitHub: {str(e)}")
+        st.error(f"❌ Error updating GitHub: {str(e)}")
+        import traceback
+        st.error(f"Full error details: {traceback.format_exc()}")
         return False
 
 def setup_github_token_instructions():
@@ -1,13 +1,29 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 from datetime import datetime, date
 import random
-from config import GAMES, PLAYERS, CELEBRATION_MESSAGES, CELEBRATION_GIFS, BAD_SCORE_MESSAGES, BAD_SCORE_GIFS
-from scoring_engine import calculate_daily_results, calculate_special_score, format_results_for_display
+from config import GAMES, PLAYERS, CELEBRATION_MESSAGES, CELEBRATION_GIFS, BAD_SCORE_MESSAGES, BAD_SCORE_GIFS, BAD_SCORE_THRESHOLDS
+from scoring_engine import calculate_daily_results, calculate_special_scores_batch, format_results_for_display
 from data_manager import save_daily_results, check_date_exists
 from daily_winners import save_daily_winner
 from github_integration import save_results_to_github
 
+# Derived once at import time; rebuilding these on every Streamlit rerun
+# is pure churn since PLAYERS and GAMES never change while running
+_GAME_LIST = list(GAMES.keys())
+_DEFAULT_PARTICIPATION = {player: True for player in PLAYERS}
+
+# Widget keys must be strings, but they never change - build them all up
+# front instead of re-formatting f-strings in the render loops
+_PARTICIPATION_KEYS = {player: f"participation_{player}" for player in PLAYERS}
+_WIDGET_KEYS = {
+    (game, player, role): f"{game}_{player}_{role}" if role else f"{game}_{player}"
+    for game in _GAME_LIST
+    for player in PLAYERS
+    for role in ("", "result", "guesses", "distance")
+}
+
 def show():
     st.title("📅 Daily Score Submission")
     
@@ -31,8 +47,7 @@ def show():
     st.write("Select which players participated today:")
     
     # Initialize session state for participation
-    if 'player_participation' not in st.session_state:
-        st.session_state.player_participation = {player: True for player in PLAYERS}
+    st.session_state.setdefault('player_participation', dict(_DEFAULT_PARTICIPATION))
     
     participation_cols = st.columns(len(PLAYERS))
     for i, player in enumerate(PLAYERS):
@@ -40,12 +55,15 @@ def show():
             st.session_state.player_participation[player] = st.checkbox(
                 f"✅ {player}",
                 value=st.session_state.player_participation[player],
-                key=f"participation_{player}"
+                key=_PARTICIPATION_KEYS[player]
             )
     
-    # Get list of participating players
+    # Get list of participating players; compute the complement once so
+    # the per-game loops below don't rescan the list per player
     participating_players = [player for player in PLAYERS if st.session_state.player_participation[player]]
-    
+    participating_set = frozenset(participating_players)
+    non_participants = [player for player in PLAYERS if player not in participating_set]
+
     if not participating_players:
         st.error("❌ At least one player must participate!")
         return
@@ -56,109 +74,130 @@ def show():
     st.subheader("🎮 Enter Scores for Participating Players")
     
     # Initialize session state for scores
+    # Keyed flat by (game, player): one hash per access instead of two
+    # nested dict lookups in the render and calculate loops
     if 'scores_data' not in st.session_state:
-        st.session_state.scores_data = {}
-        for game in GAMES.keys():
-            st.session_state.scores_data[game] = {}
-            for player in PLAYERS:
-                st.session_state.scores_data[game][player] = None
+        st.session_state.scores_data = {
+            (game, player): None for game in _GAME_LIST for player in PLAYERS
+        }
     
-    # Create input fields for each game - only for participating players
-    for game in GAMES.keys():
-        st.markdown(f"### 🌍 {game}")
+    # Batch the score entry in a form: editing any input no longer reruns
+    # the whole script, everything is applied in the single submit rerun
+    with st.form("daily_scores_form", clear_on_submit=False):
+        # Create input fields for each game - only for participating players
+        for game in _GAME_LIST:
+            st.markdown(f"### 🌍 {game}")
         
-        if GAMES[game]["type"] == "standard":
-            # Standard games - simple number input
-            cols = st.columns(len(participating_players))
-            for i, player in enumerate(participating_players):
-                with cols[i]:
-                    if game == "Travle":
-                        score = st.number_input(
-                            f"{player}",
-                            min_value=-1,
-                            max_value=100,
-                            value=-1,
-                            key=f"{game}_{player}",
-                            help="Enter score (-1 to 100)"
-                        )
-                    elif game == "Geogrid":
-                        score = st.number_input(
-                            f"{player}",
-                            min_value=0,
-                            max_value=900,
-                            value=0,
-                            step=1,
-                            key=f"{game}_{player}",
-                            help="Enter score (0 to 900, integers only)"
-                        )
-                    else:
-                        score = st.number_input(
-                            f"{player}",
-                            min_value=1,
-                            max_value=100,
-                            value=1,
-                            key=f"{game}_{player}",
-                            help="Enter score (1 to 100)"
-                        )
-                    st.session_state.scores_data[game][player] = score
+            if GAMES[game]["type"] == "standard":
+                # Standard games - simple number input
+                cols = st.columns(len(participating_players))
+                for i, player in enumerate(participating_players):
+                    with cols[i]:
+                        if game == "Travle":
+                            score = st.number_input(
+                                f"{player}",
+                                min_value=-1,
+                                max_value=100,
+                                value=-1,
+                                key=_WIDGET_KEYS[(game, player, "")],
+                                help="Enter score (-1 to 100)"
+                            )
+                        elif game == "Geogrid":
+                            score = st.number_input(
+                                f"{player}",
+                                min_value=0,
+                                max_value=900,
+                                value=0,
+                                step=1,
+                                key=_WIDGET_KEYS[(game, player, "")],
+                                help="Enter score (0 to 900, integers only)"
+                            )
+                        else:
+                            score = st.number_input(
+                                f"{player}",
+                                min_value=1,
+                                max_value=100,
+                                value=1,
+                                key=_WIDGET_KEYS[(game, player, "")],
+                                help="Enter score (1 to 100)"
+                            )
+                        st.session_state.scores_data[(game, player)] = score
             
-            # Set non-participating players to None
-            for player in PLAYERS:
-                if player not in participating_players:
-                    st.session_state.scores_data[game][player] = None
+                # Set non-participating players to None
+                for player in non_participants:
+                    st.session_state.scores_data[(game, player)] = None
         
-        else:
-            # Special games (NoBordle, ImpossiBordle)
-            cols = st.columns(len(participating_players))
-            for i, player in enumerate(participating_players):
-                with cols[i]:
-                    st.markdown(f"**{player}**")
-                    
-                    # Correct/Incorrect selection
-                    correct = st.radio(
-                        "Result:",
-                        ["Correct", "Incorrect"],
-                        key=f"{game}_{player}_result",
-                        horizontal=True
-                    )
-                    
-                    if correct == "Correct":
+            else:
+                # Special games (NoBordle, ImpossiBordle) - render the
+                # widgets first, then score the whole game in one
+                # vectorized call instead of per-player scalar math
+                cols = st.columns(len(participating_players))
+                entries = []
+                for i, player in enumerate(participating_players):
+                    with cols[i]:
+                        st.markdown(f"**{player}**")
+
+                        # Correct/Incorrect selection. Widgets inside a
+                        # form don't trigger reruns, so both inputs are
+                        # always rendered and the radio decides which
+                        # one counts when the form is submitted
+                        correct = st.radio(
+                            "Result:",
+                            ["Correct", "Incorrect"],
+                            key=_WIDGET_KEYS[(game, player, "result")],
+                            horizontal=True
+                        )
+
                         guesses = st.number_input(
                             "Number of guesses:",
                             min_value=1,
                             max_value=20,
                             value=1,
                             step=1,
-                            key=f"{game}_{player}_guesses"
+                            key=_WIDGET_KEYS[(game, player, "guesses")],
+                            help="Used when the result is Correct"
                         )
-                        raw_score = calculate_special_score(True, int(guesses), game)
-                    else:
                         distance = st.number_input(
                             "Distance (miles):",
                             min_value=0,
                             value=0,
                             step=1,
-                            key=f"{game}_{player}_distance"
+                            key=_WIDGET_KEYS[(game, player, "distance")],
+                            help="Used when the result is Incorrect"
                         )
-                        raw_score = calculate_special_score(False, int(distance), game)
-                    
-                    st.session_state.scores_data[game][player] = raw_score
-                    st.caption(f"Calculated score: {raw_score:.2f}")
+
+                        if correct == "Correct":
+                            entries.append((True, int(guesses)))
+                        else:
+                            entries.append((False, int(distance)))
+
+                batch_scores = calculate_special_scores_batch(
+                    [correct for correct, _ in entries],
+                    [value for _, value in entries]
+                )
+                for i, (player, (correct, value)) in enumerate(zip(participating_players, entries)):
+                    # Correct low-guess answers keep their integer score,
+                    # matching the scalar calculate_special_score
+                    raw_score = value if correct and value <= 6 else float(batch_scores[i])
+                    st.session_state.scores_data[(game, player)] = raw_score
+                    with cols[i]:
+                        st.caption(f"Calculated score: {raw_score:.2f}")
             
-            # Set non-participating players to None
-            for player in PLAYERS:
-                if player not in participating_players:
-                    st.session_state.scores_data[game][player] = None
-    
+                # Set non-participating players to None
+                for player in non_participants:
+                    st.session_state.scores_data[(game, player)] = None
+
+        calculate_clicked = st.form_submit_button("🧮 Calculate Results", type="primary")
+
     st.markdown("---")
     
-    # Calculate results button
-    if st.button("🧮 Calculate Results", type="primary"):
+    # Calculate results
+    if calculate_clicked:
         # Prepare data for calculation - no validation needed since all fields have default values
         scores_for_calculation = {}
-        for game in GAMES.keys():
+        for game in _GAME_LIST:
             scores_for_calculation[game] = [
-                st.session_state.scores_data[game][player] for player in PLAYERS
+                st.session_state.scores_data[(game, player)] for player in PLAYERS
             ]
         
         # Calculate results and store globally
@@ -219,9 +258,8 @@ def show():
                             del st.session_state[key]
                     
                     # Clear scores data
-                    for game in GAMES.keys():
-                        for player in PLAYERS:
-                            st.session_state.scores_data[game][player] = None
+                    for key in st.session_state.scores_data:
+                        st.session_state.scores_data[key] = None
                     
                     st.rerun()
 
@@ -263,80 +301,68 @@ def display_results(results):
     # Detailed results
     st.subheader("📊 Detailed Results")
     
-    # Create results table with humor for bad scores - only participating players
-    results_data = []
-    for i, player in enumerate(PLAYERS):
-        # Check if player participated in any game
-        participated = any(
-            results["raw_scores"][game][i] is not None 
-            for game in results["raw_scores"]
-        )
-        
-        if participated:
-            row = {"Player": player, "Total Score": f"{results['total_scores'][i]:.3f}"}
-            for game in GAMES.keys():
-                if game in results["raw_scores"]:
-                    raw = results["raw_scores"][game][i]
-                    weighted = results["normalized_weighted"][game][i]
-                    
-                    if raw is not None:
-                        # Check for bad scores and add humor
-                        raw_display = str(raw)
-                        if game in ["Worldle", "Globle", "Countryle"] and raw >= 10:
-                            raw_display = f"{raw} 😬"
-                        elif game == "Travle" and raw >= 3:
-                            raw_display = f"{raw} 😬"
-                        elif game == "Geogrid" and raw >= 200:
-                            raw_display = f"{raw} 😬"
-                        
-                        row[f"{game} (Raw)"] = raw_display
-                        row[f"{game} (Weighted)"] = f"{weighted:.3f}"
-                    else:
-                        row[f"{game} (Raw)"] = "N/A"
-                        row[f"{game} (Weighted)"] = "N/A"
-            results_data.append(row)
-    
-    # Sort by total score for display
-    results_data.sort(key=lambda x: float(x["Total Score"]))
-    
-    # Add rank with proper tie handling
-    current_rank = 1
-    prev_score = None
-    for i, row in enumerate(results_data):
-        current_score = float(row["Total Score"])
-        
-        # If this score is different from previous, update rank
-        if prev_score is not None and current_score != prev_score:
-            current_rank = i + 1
-        
-        medal = "🥇" if current_rank == 1 else "🥈" if current_rank == 2 else "🥉" if current_rank == 3 else "🏅"
-        row["Rank"] = f"{current_rank} {medal}"
-        prev_score = current_score
-    
-    # Reorder columns
-    columns = ["Rank", "Player", "Total Score"]
-    for game in GAMES.keys():
-        if f"{game} (Raw)" in results_data[0]:
-            columns.extend([f"{game} (Raw)", f"{game} (Weighted)"])
-    
-    df = pd.DataFrame(results_data)[columns]
+    # Stack the raw scores into a games x players matrix once (NaN for
+    # non-participants); the bad-score checks below become one vectorized
+    # comparison against per-game thresholds instead of per-cell branches
+    present_games = [g for g in _GAME_LIST if g in results["raw_scores"]]
+    raw_2d = np.array([
+        [np.nan if v is None else float(v) for v in results["raw_scores"][g]]
+        for g in present_games
+    ], dtype=float)
+    thresholds = np.array([
+        BAD_SCORE_THRESHOLDS.get(g, np.inf) for g in present_games
+    ], dtype=float)
+    bad_mask = raw_2d >= thresholds[:, None]
+    # Per-game participation; a game nobody played contributes nothing to
+    # the table, so its column pass can be skipped outright
+    game_has_data = ~np.isnan(raw_2d).all(axis=1)
+
+    # Create results table with humor for bad scores - only participating
+    # players. Build it column-first so the sort and rank run on the
+    # numeric totals; strings only appear at display time.
+    participated_idx = np.flatnonzero(~np.isnan(raw_2d).all(axis=0))
+
+    table = {
+        "Player": [PLAYERS[i] for i in participated_idx],
+        "Total Score": [results["total_scores"][i] for i in participated_idx],
+    }
+    for gi, game in enumerate(present_games):
+        if not game_has_data[gi]:
+            continue
+        raw_scores = results["raw_scores"][game]
+        weighted_scores = results["normalized_weighted"][game]
+        raw_col = []
+        weighted_col = []
+        for i in participated_idx:
+            raw = raw_scores[i]
+            if raw is not None:
+                # Check for bad scores and add humor
+                raw_col.append(f"{raw} 😬" if bad_mask[gi, i] else str(raw))
+                weighted_col.append(f"{weighted_scores[i]:.3f}")
+            else:
+                raw_col.append("N/A")
+                weighted_col.append("N/A")
+        table[f"{game} (Raw)"] = raw_col
+        table[f"{game} (Weighted)"] = weighted_col
+
+    df = pd.DataFrame(table).sort_values("Total Score").reset_index(drop=True)
+
+    # Rank with tie handling; method="min" gives tied totals the same rank
+    ranks = df["Total Score"].rank(method="min").astype(int)
+    medals = {1: "🥇", 2: "🥈", 3: "🥉"}
+    df.insert(0, "Rank", [f"{rank} {medals.get(rank, '🏅')}" for rank in ranks])
+    df["Total Score"] = df["Total Score"].map("{:.3f}".format)
     st.dataframe(df, use_container_width=True)
     
-    # Display individual humor messages for bad scores
-    bad_scores_found = []
-    for i, player in enumerate(PLAYERS):
-        for game in GAMES.keys():
-            if game in results["raw_scores"]:
-                raw = results["raw_scores"][game][i]
-                if game in ["Worldle", "Globle", "Countryle"] and raw >= 10:
-                    humor_msg = random.choice(BAD_SCORE_MESSAGES)
-                    bad_scores_found.append(f"**{player}** in {game}: {humor_msg}")
-                elif game == "Travle" and raw >= 3:
-                    humor_msg = random.choice(BAD_SCORE_MESSAGES)
-                    bad_scores_found.append(f"**{player}** in {game}: {humor_msg}")
-                elif game == "Geogrid" and raw >= 200:
-                    humor_msg = random.choice(BAD_SCORE_MESSAGES)
-                    bad_scores_found.append(f"**{player}** in {game}: {humor_msg}")
+    # Display individual humor messages for bad scores - the offending
+    # (game, player) cells come straight from the precomputed mask, and
+    # all the messages are sampled in one batched RNG call
+    bad_cells = np.argwhere(bad_mask)
+    messages = random.choices(BAD_SCORE_MESSAGES, k=len(bad_cells))
+    bad_scores_found = [
+        f"**{PLAYERS[pi]}** in {present_games[gi]}: {message}"
+        for (gi, pi), message in zip(bad_cells, messages)
+    ]
     
     if bad_scores_found:
         st.markdown("### 😅 Score Commentary")
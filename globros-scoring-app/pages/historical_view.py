@@ -1,19 +1,169 @@
+import io
+import requests
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
-from data_manager import load_historical_data, get_player_statistics
-from daily_winners import load_daily_winners
-from config import PLAYERS, GAMES
+from config import PLAYERS
 
-def calculate_stats_from_dataframes(df_scores, df_winners):
+# Point budget per trend trace; Plotly SVG scatter degrades sharply once
+# traces run to thousands of DOM nodes
+_MAX_TREND_POINTS = 500
+
+def _downsample(dates, scores, max_points=_MAX_TREND_POINTS):
+    """
+    Thin a trace to at most max_points by even striding, keeping the
+    first and last samples, so long histories stay cheap to draw.
+    """
+    n = len(dates)
+    if n <= max_points:
+        return dates, scores
+    idx = np.linspace(0, n - 1, max_points).round().astype(int)
+    return [dates[i] for i in idx], [scores[i] for i in idx]
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _load_csv(url):
+    """
+    Fetch and parse a data CSV from GitHub, cached across reruns so
+    widget interactions don't re-download it. Dates are parsed to
+    datetime64 here, once per cache epoch, so downstream sorts and
+    formatting never reparse the strings.
+
+    Fetching through requests with Accept-Encoding: gzip lets the GitHub
+    CDN compress the CSV on the wire (requests decodes it transparently),
+    which matters as the history file grows.
+    """
+    resp = requests.get(url, headers={"Accept-Encoding": "gzip"}, timeout=10)
+    resp.raise_for_status()
+    df = pd.read_csv(io.BytesIO(resp.content), parse_dates=["date"])
+    # Coerce score columns to clean floats at ingest so no downstream
+    # aggregation has to re-filter strings or blanks out of them
+    for col in ("raw_score", "normalized_weighted_score"):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    # player, game and winner are tiny fixed vocabularies; category codes
+    # shrink the frame and let counts and filters hash small ints instead
+    # of strings
+    for col in ("player", "game", "winner"):
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _build_win_pie(win_items):
+    """
+    Pie chart of daily wins by player, cached across reruns. Takes the
+    tallies as a tuple of (player, count) pairs so the cache key is a
+    cheap tuple hash rather than a hash of a whole Series.
+    """
+    # Deferred: plotly's import chain is expensive at cold start
+    import plotly.express as px
+    fig = px.pie(
+        values=[count for _, count in win_items],
+        names=[player for player, _ in win_items],
+        title="Daily Wins by Player",
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _build_trend_fig(trends_frozen):
+    """
+    Line chart of total weighted scores over time. Takes the trends as a
+    tuple of (player, dates, scores) tuples so the cache can hash them.
+    """
+    import plotly.express as px
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    colors = px.colors.qualitative.Set2
+    for i, (player, dates, scores) in enumerate(trends_frozen):
+        if dates:
+            fig.add_trace(go.Scattergl(
+                x=list(dates),
+                y=list(scores),
+                mode='lines+markers',
+                name=player,
+                line=dict(color=colors[i % len(colors)], width=3),
+                marker=dict(size=8)
+            ))
+    fig.update_layout(
+        title="Player Performance Over Time (Lower is Better)",
+        xaxis_title="Date",
+        yaxis_title="Total Weighted Score",
+        hovermode='x unified',
+        template="plotly_white"
+    )
+    return fig
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _build_placements_fig(placements_df):
+    """Line chart of daily placements by player, cached across reruns."""
+    import plotly.express as px
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    colors = px.colors.qualitative.Set2
+    for i, player in enumerate(PLAYERS):
+        player_placements = placements_df[placements_df["player"] == player].sort_values("date")
+        if not player_placements.empty:
+            fig.add_trace(go.Scattergl(
+                x=player_placements["date"],
+                y=player_placements["placement"],
+                mode='lines+markers',
+                name=player,
+                line=dict(color=colors[i % len(colors)], width=3),
+                marker=dict(size=8)
+            ))
+    fig.update_layout(
+        title="Daily Placement by Player (Lower is Better)",
+        xaxis_title="Date",
+        yaxis_title="Placement",
+        yaxis=dict(
+            autorange="reversed",  # Reverse y-axis so 1st place is at top
+            dtick=1,  # Show integer ticks only
+            range=[max(placements_df["placement"]) + 0.5, 0.5]  # Set range from worst to best
+        ),
+        hovermode='x unified',
+        template="plotly_white"
+    )
+    return fig
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _build_game_avg_fig(game_avg_df):
+    """Grouped bar chart of average raw scores, cached across reruns."""
+    import plotly.express as px
+    fig = px.bar(
+        game_avg_df,
+        x="Game",
+        y="Average Score",
+        color="Player",
+        barmode="group",
+        title="Average Raw Scores by Game and Player",
+        color_discrete_sequence=px.colors.qualitative.Set2
+    )
+    fig.update_layout(template="plotly_white")
+    return fig
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _prepare_recent(winners_df):
+    """
+    Last ten daily winners, newest first, formatted for display. Cached
+    so widget reruns don't redo the tail/sort/format work.
+    """
+    # nlargest does a heap partial sort instead of sorting every row,
+    # and doesn't rely on the CSV already being in date order
+    recent = winners_df.nlargest(10, "date")
+    recent["date"] = recent["date"].dt.strftime("%Y-%m-%d")
+    recent.columns = ["Date", "Winner"]
+    return recent
+
+@st.cache_data(ttl=600, show_spinner=False)
+def calculate_stats_from_dataframes(df_scores, win_counts):
     """
     Calculate comprehensive player statistics from GitHub dataframes.
     
     Args:
         df_scores (pd.DataFrame): Historical scores data
-        df_winners (pd.DataFrame): Daily winners data
+        win_counts (pd.Series): Daily win tallies per player
     
     Returns:
         dict: Dictionary with various statistics
@@ -21,53 +171,50 @@ def calculate_stats_from_dataframes(df_scores, df_winners):
     try:
         if df_scores.empty:
             return {}
-        
+
+        # raw_score is already a clean float column (coerced at load
+        # time); dropping its NaNs is all the filtering the games need
+        scored = df_scores.dropna(subset=["raw_score"])
+
         stats = {
-            "total_games_played": len(df_scores["date"].unique()),
-            "win_counts": df_winners["winner"].value_counts().to_dict() if not df_winners.empty else {},
+            "total_games_played": df_scores["date"].nunique(),
+            "win_counts": win_counts.to_dict(),
             "average_scores_by_game": {},
             "player_performance_trends": {},
             "game_difficulty_analysis": {}
         }
-        
-        # Average scores by game and player
-        for game in GAMES.keys():
-            game_data = df_scores[df_scores["game"] == game]
-            if not game_data.empty:
-                # Filter out empty/null raw scores
-                game_data_clean = game_data[game_data["raw_score"].notna() & (game_data["raw_score"] != "")]
-                if not game_data_clean.empty:
-                    # Convert to numeric if needed
-                    game_data_clean["raw_score"] = pd.to_numeric(game_data_clean["raw_score"], errors='coerce')
-                    avg_scores = game_data_clean.groupby("player")["raw_score"].mean().to_dict()
-                    stats["average_scores_by_game"][game] = avg_scores
-        
-        # Player performance trends (total weighted scores over time)
-        daily_totals = df_scores.groupby(["date", "player"])["normalized_weighted_score"].sum().reset_index()
+
+        # Average scores by game and player - one grouped pass instead of
+        # a full-frame filter per game
+        avg_scores = scored.groupby(["game", "player"], observed=True)["raw_score"].mean()
+        stats["average_scores_by_game"] = {
+            game: scores.droplevel("game").to_dict()
+            for game, scores in avg_scores.groupby(level="game", observed=True)
+        }
+
+        # Player performance trends (total weighted scores over time) -
+        # group once and hand out the per-player slices
+        daily_totals = df_scores.groupby(["date", "player"], observed=True)["normalized_weighted_score"].sum().reset_index()
+        trend_groups = dict(tuple(daily_totals.sort_values("date").groupby("player", observed=True)))
         for player in PLAYERS:
-            player_data = daily_totals[daily_totals["player"] == player].sort_values("date")
+            player_data = trend_groups.get(player)
             stats["player_performance_trends"][player] = {
-                "dates": player_data["date"].tolist(),
-                "scores": player_data["normalized_weighted_score"].tolist()
+                "dates": player_data["date"].tolist() if player_data is not None else [],
+                "scores": player_data["normalized_weighted_score"].tolist() if player_data is not None else []
             }
-        
-        # Game difficulty analysis (average raw scores)
-        for game in GAMES.keys():
-            game_data = df_scores[df_scores["game"] == game]
-            if not game_data.empty:
-                # Filter out empty/null raw scores and convert to numeric
-                game_data_clean = game_data[game_data["raw_score"].notna() & (game_data["raw_score"] != "")]
-                if not game_data_clean.empty:
-                    game_data_clean["raw_score"] = pd.to_numeric(game_data_clean["raw_score"], errors='coerce')
-                    game_data_clean = game_data_clean[game_data_clean["raw_score"].notna()]
-                    
-                    if not game_data_clean.empty:
-                        stats["game_difficulty_analysis"][game] = {
-                            "average_score": game_data_clean["raw_score"].mean(),
-                            "median_score": game_data_clean["raw_score"].median(),
-                            "std_dev": game_data_clean["raw_score"].std()
-                        }
-        
+
+        # Game difficulty analysis (average raw scores) - single grouped
+        # aggregation
+        by_game = scored.groupby("game", observed=True)["raw_score"].agg(["mean", "median", "std"])
+        stats["game_difficulty_analysis"] = {
+            game: {
+                "average_score": row["mean"],
+                "median_score": row["median"],
+                "std_dev": row["std"]
+            }
+            for game, row in by_game.iterrows()
+        }
+
         return stats
     
     except Exception as e:
@@ -83,8 +230,8 @@ def show():
         scores_url = data_dir + "scores_history.csv"
         placements_url = data_dir + "daily_placements.csv"
         
-        df_scores_data = pd.read_csv(scores_url)
-        df_placements_data = pd.read_csv(placements_url)
+        df_scores_data = _load_csv(scores_url)
+        df_placements_data = _load_csv(placements_url)
         
         # Use the GitHub dataframes
         df = df_scores_data
@@ -99,8 +246,14 @@ def show():
             st.info("📝 No historical data available yet. Submit some daily scores to see statistics!")
             return
         
+        # Win tallies feed the stats, the Most Wins metric and the pie
+        # chart - count the column once. winner is categorical, so drop
+        # the zero-count categories value_counts reports for it.
+        win_counts = winners_df["winner"].value_counts() if not winners_df.empty else pd.Series(dtype=int)
+        win_counts = win_counts[win_counts > 0]
+
         # Calculate stats from the GitHub data
-        stats = calculate_stats_from_dataframes(df, winners_df)
+        stats = calculate_stats_from_dataframes(df, win_counts)
         
     except Exception as e:
         st.error(f"❌ Error loading historical data: {str(e)}")
@@ -114,16 +267,11 @@ def show():
     with col1:
         st.metric("Total Games Played", stats.get("total_games_played", 0))
     with col2:
-        if winners_df.empty:
-            most_wins_player = "N/A"
-            most_wins_count = 0
-        else:
-            win_counts = winners_df["winner"].value_counts()
-            most_wins_player = win_counts.index[0] if len(win_counts) > 0 else "N/A"
-            most_wins_count = win_counts.iloc[0] if len(win_counts) > 0 else 0
+        most_wins_player = win_counts.index[0] if len(win_counts) > 0 else "N/A"
+        most_wins_count = win_counts.iloc[0] if len(win_counts) > 0 else 0
         st.metric("Most Wins", f"{most_wins_player} ({most_wins_count})")
     with col3:
-        unique_dates = len(df["date"].unique())
+        unique_dates = df["date"].nunique()
         st.metric("Days Recorded", unique_dates)
     with col4:
         total_scores = len(df)
@@ -135,17 +283,8 @@ def show():
     if not winners_df.empty:
         st.subheader("🏆 Win Distribution")
         
-        win_counts = winners_df["winner"].value_counts()
-        
-        # Create pie chart
-        fig_pie = px.pie(
-            values=win_counts.values,
-            names=win_counts.index,
-            title="Daily Wins by Player",
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig_pie, use_container_width=True)
+        # Create pie chart (cached; rebuilt only when the counts change)
+        st.plotly_chart(_build_win_pie(tuple(win_counts.items())), use_container_width=True)
         
         # Win counts table
         col1, col2 = st.columns([1, 1])
@@ -164,67 +303,22 @@ def show():
     st.subheader("📈 Performance Trends")
     
     if "player_performance_trends" in stats and stats["player_performance_trends"]:
-        # Create line chart for performance over time
-        fig_trends = go.Figure()
-        
-        colors = px.colors.qualitative.Set2
-        for i, player in enumerate(PLAYERS):
-            if player in stats["player_performance_trends"]:
-                trend_data = stats["player_performance_trends"][player]
-                if trend_data["dates"]:
-                    fig_trends.add_trace(go.Scatter(
-                        x=trend_data["dates"],
-                        y=trend_data["scores"],
-                        mode='lines+markers',
-                        name=player,
-                        line=dict(color=colors[i % len(colors)], width=3),
-                        marker=dict(size=8)
-                    ))
-        
-        fig_trends.update_layout(
-            title="Player Performance Over Time (Lower is Better)",
-            xaxis_title="Date",
-            yaxis_title="Total Weighted Score",
-            hovermode='x unified',
-            template="plotly_white"
-        )
-        
-        st.plotly_chart(fig_trends, use_container_width=True)
+        # Freeze the trend dict into tuples (downsampled to the trace
+        # point budget) so the cached figure builder can hash its input
+        trends_frozen = []
+        for player in PLAYERS:
+            trend_data = stats["player_performance_trends"].get(player)
+            if trend_data is None:
+                continue
+            dates, scores = _downsample(trend_data["dates"], trend_data["scores"])
+            trends_frozen.append((player, tuple(dates), tuple(scores)))
+        trends_frozen = tuple(trends_frozen)
+        st.plotly_chart(_build_trend_fig(trends_frozen), use_container_width=True)
     
     # Placement trends chart
     if not placements_df.empty:
         st.subheader("🏆 Daily Placement Trends")
-        
-        # Create line chart for placements over time
-        fig_placements = go.Figure()
-        
-        colors = px.colors.qualitative.Set2
-        for i, player in enumerate(PLAYERS):
-            player_placements = placements_df[placements_df["player"] == player].sort_values("date")
-            if not player_placements.empty:
-                fig_placements.add_trace(go.Scatter(
-                    x=player_placements["date"],
-                    y=player_placements["placement"],
-                    mode='lines+markers',
-                    name=player,
-                    line=dict(color=colors[i % len(colors)], width=3),
-                    marker=dict(size=8)
-                ))
-        
-        fig_placements.update_layout(
-            title="Daily Placement by Player (Lower is Better)",
-            xaxis_title="Date",
-            yaxis_title="Placement",
-            yaxis=dict(
-                autorange="reversed",  # Reverse y-axis so 1st place is at top
-                dtick=1,  # Show integer ticks only
-                range=[max(placements_df["placement"]) + 0.5, 0.5]  # Set range from worst to best
-            ),
-            hovermode='x unified',
-            template="plotly_white"
-        )
-        
-        st.plotly_chart(fig_placements, use_container_width=True)
+        st.plotly_chart(_build_placements_fig(placements_df), use_container_width=True)
     
     st.markdown("---")
     
@@ -235,46 +329,30 @@ def show():
     if "average_scores_by_game" in stats:
         st.subheader("📊 Average Raw Scores by Game")
         
-        game_avg_data = []
-        for game, player_avgs in stats["average_scores_by_game"].items():
-            for player, avg_score in player_avgs.items():
-                game_avg_data.append({
-                    "Game": game,
-                    "Player": player,
-                    "Average Score": avg_score
-                })
-        
-        if game_avg_data:
-            game_avg_df = pd.DataFrame(game_avg_data)
-            
-            # Create grouped bar chart
-            fig_games = px.bar(
-                game_avg_df,
-                x="Game",
-                y="Average Score",
-                color="Player",
-                barmode="group",
-                title="Average Raw Scores by Game and Player",
-                color_discrete_sequence=px.colors.qualitative.Set2
-            )
-            fig_games.update_layout(template="plotly_white")
-            st.plotly_chart(fig_games, use_container_width=True)
+        # Reshape the nested dict in one melt instead of a Python loop
+        # building a dict per (game, player) cell
+        game_avg_df = (pd.DataFrame(stats["average_scores_by_game"])
+                       .rename_axis("Player")
+                       .reset_index()
+                       .melt(id_vars="Player", var_name="Game", value_name="Average Score")
+                       .dropna(subset=["Average Score"]))
+
+        if not game_avg_df.empty:
+            st.plotly_chart(_build_game_avg_fig(game_avg_df), use_container_width=True)
     
     # Game difficulty analysis
     if "game_difficulty_analysis" in stats:
         st.subheader("🎯 Game Difficulty Analysis")
         
-        difficulty_data = []
-        for game, analysis in stats["game_difficulty_analysis"].items():
-            difficulty_data.append({
-                "Game": game,
-                "Average Score": analysis["average_score"],
-                "Median Score": analysis["median_score"],
-                "Standard Deviation": analysis["std_dev"]
+        difficulty = stats["game_difficulty_analysis"]
+
+        if difficulty:
+            difficulty_df = pd.DataFrame({
+                "Game": list(difficulty.keys()),
+                "Average Score": [a["average_score"] for a in difficulty.values()],
+                "Median Score": [a["median_score"] for a in difficulty.values()],
+                "Standard Deviation": [a["std_dev"] for a in difficulty.values()]
             })
-        
-        if difficulty_data:
-            difficulty_df = pd.DataFrame(difficulty_data)
             st.dataframe(difficulty_df.round(2), use_container_width=True)
     
     st.markdown("---")
@@ -283,18 +361,25 @@ def show():
     st.subheader("📅 Recent Games")
     
     if not winners_df.empty:
-        recent_winners = winners_df.tail(10).sort_values("date", ascending=False)
-        recent_winners["date"] = pd.to_datetime(recent_winners["date"]).dt.strftime("%Y-%m-%d")
-        recent_winners.columns = ["Date", "Winner"]
-        st.dataframe(recent_winners, use_container_width=True)
+        st.dataframe(_prepare_recent(winners_df), use_container_width=True)
     
     st.markdown("---")
     
-    # Raw data export
+    _export_fragment(df, winners_df)
+
+@st.fragment
+def _export_fragment(df, winners_df):
+    """
+    Data export buttons and raw-data expander, isolated so a download
+    click reruns only this block instead of rebuilding every chart and
+    metric above it.
+    """
     st.subheader("📤 Data Export")
-    
+
     col1, col2 = st.columns(2)
-    
+
+    from datetime import datetime
+
     with col1:
         if st.button("📊 Download Historical Data"):
             csv = df.to_csv(index=False)
@@ -304,7 +389,7 @@ def show():
                 file_name=f"globros_scores_{datetime.now().strftime('%Y%m%d')}.csv",
                 mime="text/csv"
             )
-    
+
     with col2:
         if st.button("🏆 Download Winners Data"):
             if not winners_df.empty:
@@ -315,7 +400,7 @@ def show():
                     file_name=f"globros_winners_{datetime.now().strftime('%Y%m%d')}.csv",
                     mime="text/csv"
                 )
-    
+
     # Show raw data table (optional)
     with st.expander("🔍 View Raw Data"):
         st.dataframe(df, use_container_width=True)
@@ -1,70 +1,196 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import numpy as np
-from data_manager import load_historical_data, get_player_statistics
-from daily_winners import load_daily_winners
 from config import PLAYERS, GAMES
 
+@st.cache_data(ttl=600, show_spinner=False)
+def _build_radar_fig(player, games, averages):
+    """Radar chart of a player's per-game averages, cached across reruns."""
+    # Deferred: plotly's import chain is expensive at cold start
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    fig.add_trace(go.Scatterpolar(
+        r=list(averages),
+        theta=list(games),
+        fill='toself',
+        name=player,
+        line_color='rgb(32, 201, 151)'
+    ))
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, max(averages) * 1.1]
+            )),
+        showlegend=True,
+        title=f"{player}'s Game Performance Radar"
+    )
+    return fig
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _build_player_trend_fig(player, dates, scores):
+    """Score trend plus fitted trend line for one player, cached."""
+    # Deferred: plotly's import chain is expensive at cold start
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=list(dates),
+        y=list(scores),
+        mode='lines+markers',
+        name=player,
+        line=dict(color='rgb(32, 201, 151)', width=3),
+        marker=dict(size=8)
+    ))
+
+    # Add trend line - closed-form least squares; np.polyfit runs a full
+    # SVD for what is just a degree-1 fit
+    x = np.arange(len(dates), dtype=float)
+    y = np.asarray(scores, dtype=float)
+    xm, ym = x.mean(), y.mean()
+    denom = np.dot(x - xm, x - xm)
+    slope = np.dot(x - xm, y - ym) / denom if denom else 0.0
+    trendline = slope * (x - xm) + ym
+
+    fig.add_trace(go.Scattergl(
+        x=list(dates),
+        y=trendline,
+        mode='lines',
+        name='Trend',
+        line=dict(color='red', dash='dash')
+    ))
+
+    fig.update_layout(
+        title=f"{player}'s Score Trend Over Time",
+        xaxis_title="Date",
+        yaxis_title="Total Weighted Score",
+        template="plotly_white"
+    )
+    return fig
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _build_h2h_bar_fig(player1, player2, games, p1_avgs, p2_avgs):
+    """Grouped bars of two players' per-game averages, cached."""
+    # Deferred: plotly's import chain is expensive at cold start
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        name=player1,
+        x=list(games),
+        y=list(p1_avgs),
+        marker_color='rgb(55, 83, 109)'
+    ))
+    fig.add_trace(go.Bar(
+        name=player2,
+        x=list(games),
+        y=list(p2_avgs),
+        marker_color='rgb(26, 118, 255)'
+    ))
+    fig.update_layout(
+        title=f"Average Scores: {player1} vs {player2}",
+        xaxis_title="Game",
+        yaxis_title="Average Score",
+        barmode='group',
+        template="plotly_white"
+    )
+    return fig
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _build_h2h_trend_fig(player1, player2, p1_frozen, p2_frozen):
+    """Overlaid score trends for two players, cached."""
+    # Deferred: plotly's import chain is expensive at cold start
+    import plotly.graph_objects as go
+    fig = go.Figure()
+
+    for name, color, (dates, scores) in (
+            (player1, 'rgb(55, 83, 109)', p1_frozen),
+            (player2, 'rgb(26, 118, 255)', p2_frozen)):
+        if dates:
+            fig.add_trace(go.Scattergl(
+                x=list(dates),
+                y=list(scores),
+                mode='lines+markers',
+                name=name,
+                line=dict(color=color, width=3)
+            ))
+
+    fig.update_layout(
+        title=f"Performance Trends: {player1} vs {player2}",
+        xaxis_title="Date",
+        yaxis_title="Total Weighted Score",
+        template="plotly_white"
+    )
+    return fig
+
 def show():
     st.title("👥 Player Statistics")
     
     try:
-        # Load data directly from GitHub
+        # Load data directly from GitHub through the shared cached
+        # loader, so selector interactions hit the in-memory cache
+        # instead of re-fetching and re-parsing the CSVs
+        from pages.historical_view import _load_csv, calculate_stats_from_dataframes
+
         data_dir = "https://raw.githubusercontent.com/crbrandt/globros/refs/heads/main/globros-scoring-app/data/"
         scores_url = data_dir + "scores_history.csv"
         winners_url = data_dir + "daily_winners.csv"
-        
-        df_scores_data = pd.read_csv(scores_url)
-        df_winners_data = pd.read_csv(winners_url)
-        
-        # Use the GitHub dataframes
-        df = df_scores_data
-        winners_df = df_winners_data
-        
+
+        df = _load_csv(scores_url)
+        winners_df = _load_csv(winners_url)
+
         if df.empty:
             st.info("📝 No player data available yet. Submit some daily scores to see player statistics!")
             return
-        
-        # Calculate stats from the GitHub data
-        from pages.historical_view import calculate_stats_from_dataframes
-        stats = calculate_stats_from_dataframes(df, winners_df)
+
+        # Calculate stats from the GitHub data (also cached). The win
+        # tallies are counted once here and read as a plain dict below
+        # instead of re-filtering winners_df per player
+        win_counts_series = winners_df["winner"].value_counts() if not winners_df.empty else pd.Series(dtype=int)
+        stats = calculate_stats_from_dataframes(df, win_counts_series[win_counts_series > 0])
+        win_counts = win_counts_series.to_dict()
         
     except Exception as e:
         st.error(f"❌ Error loading player data: {str(e)}")
         st.info("Please check that GitHub data files are accessible.")
         return
     
-    # Player selector
+    # Fragments: changing a selector reruns only its own block instead
+    # of the whole script, so the other charts aren't rebuilt
+    _player_details_fragment(df, win_counts, stats)
+
+    st.markdown("---")
+
+    _head_to_head_fragment(df, win_counts, stats)
+
+@st.fragment
+def _player_details_fragment(df, win_counts, stats):
+    """Player selector plus detail view, isolated for partial reruns."""
     st.subheader("🎯 Select Player for Detailed Analysis")
     selected_player = st.selectbox("Choose a player:", PLAYERS)
-    
+
     if selected_player:
-        show_player_details(selected_player, df, winners_df, stats)
-    
-    st.markdown("---")
-    
-    # Head-to-head comparison
+        show_player_details(selected_player, df, win_counts, stats)
+
+@st.fragment
+def _head_to_head_fragment(df, win_counts, stats):
+    """Head-to-head selectors plus comparison, isolated for partial reruns."""
     st.subheader("⚔️ Head-to-Head Comparison")
-    
+
     col1, col2 = st.columns(2)
     with col1:
         player1 = st.selectbox("Player 1:", PLAYERS, key="p1")
     with col2:
         player2 = st.selectbox("Player 2:", [p for p in PLAYERS if p != player1], key="p2")
-    
+
     if player1 and player2:
-        show_head_to_head(player1, player2, df, winners_df, stats)
+        show_head_to_head(player1, player2, df, win_counts, stats)
 
-def show_player_details(player, df, winners_df, stats):
+def show_player_details(player, df, win_counts, stats):
     """Show detailed statistics for a specific player."""
     
     st.subheader(f"📊 {player}'s Performance Profile")
     
     # Player summary metrics
-    player_wins = len(winners_df[winners_df["winner"] == player]) if not winners_df.empty else 0
+    player_wins = win_counts.get(player, 0)
     total_games = stats.get("total_games_played", 0)
     win_rate = (player_wins / total_games * 100) if total_games > 0 else 0
     
@@ -99,29 +225,11 @@ def show_player_details(player, df, winners_df, stats):
         
         if player_game_data:
             game_df = pd.DataFrame(player_game_data)
-            
-            # Create radar chart for game performance
-            fig_radar = go.Figure()
-            
-            fig_radar.add_trace(go.Scatterpolar(
-                r=game_df["Average Score"],
-                theta=game_df["Game"],
-                fill='toself',
-                name=player,
-                line_color='rgb(32, 201, 151)'
-            ))
-            
-            fig_radar.update_layout(
-                polar=dict(
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, max(game_df["Average Score"]) * 1.1]
-                    )),
-                showlegend=True,
-                title=f"{player}'s Game Performance Radar"
-            )
-            
-            st.plotly_chart(fig_radar, use_container_width=True)
+
+            # Radar chart for game performance (cached builder)
+            st.plotly_chart(
+                _build_radar_fig(player, tuple(game_df["Game"]), tuple(game_df["Average Score"])),
+                use_container_width=True)
             
             # Game performance table
             st.dataframe(game_df.round(2), use_container_width=True)
@@ -132,38 +240,12 @@ def show_player_details(player, df, winners_df, stats):
         
         trend_data = stats["player_performance_trends"][player]
         if trend_data["dates"]:
-            fig_trend = go.Figure()
-            
-            fig_trend.add_trace(go.Scatter(
-                x=trend_data["dates"],
-                y=trend_data["scores"],
-                mode='lines+markers',
-                name=player,
-                line=dict(color='rgb(32, 201, 151)', width=3),
-                marker=dict(size=8)
-            ))
-            
-            # Add trend line
-            x_numeric = list(range(len(trend_data["dates"])))
-            z = np.polyfit(x_numeric, trend_data["scores"], 1)
-            p = np.poly1d(z)
-            
-            fig_trend.add_trace(go.Scatter(
-                x=trend_data["dates"],
-                y=p(x_numeric),
-                mode='lines',
-                name='Trend',
-                line=dict(color='red', dash='dash')
-            ))
-            
-            fig_trend.update_layout(
-                title=f"{player}'s Score Trend Over Time",
-                xaxis_title="Date",
-                yaxis_title="Total Weighted Score",
-                template="plotly_white"
-            )
-            
-            st.plotly_chart(fig_trend, use_container_width=True)
+            from pages.historical_view import _downsample
+            dates, scores = _downsample(trend_data["dates"], trend_data["scores"])
+
+            st.plotly_chart(
+                _build_player_trend_fig(player, tuple(dates), tuple(scores)),
+                use_container_width=True)
             
             # Performance insights
             if len(trend_data["scores"]) > 1:
@@ -177,15 +259,15 @@ def show_player_details(player, df, winners_df, stats):
                 else:
                     st.info(f"➡️ {player} is maintaining consistent performance around {overall_avg:.2f}")
 
-def show_head_to_head(player1, player2, df, winners_df, stats):
+def show_head_to_head(player1, player2, df, win_counts, stats):
     """Show head-to-head comparison between two players."""
     
     st.subheader(f"⚔️ {player1} vs {player2}")
     
     # Head-to-head wins
-    if not winners_df.empty:
-        p1_wins = len(winners_df[winners_df["winner"] == player1])
-        p2_wins = len(winners_df[winners_df["winner"] == player2])
+    if win_counts:
+        p1_wins = win_counts.get(player1, 0)
+        p2_wins = win_counts.get(player2, 0)
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -205,60 +287,37 @@ def show_head_to_head(player1, player2, df, winners_df, stats):
     if "average_scores_by_game" in stats:
         st.subheader("🎮 Game-by-Game Comparison")
         
-        comparison_data = []
-        for game, player_avgs in stats["average_scores_by_game"].items():
-            if player1 in player_avgs and player2 in player_avgs:
-                comparison_data.append({
-                    "Game": game,
-                    player1: player_avgs[player1],
-                    player2: player_avgs[player2],
-                    "Difference": player_avgs[player1] - player_avgs[player2]
-                })
-        
-        if comparison_data:
-            comp_df = pd.DataFrame(comparison_data)
-            
-            # Create comparison bar chart
-            fig_comp = go.Figure()
-            
-            fig_comp.add_trace(go.Bar(
-                name=player1,
-                x=comp_df["Game"],
-                y=comp_df[player1],
-                marker_color='rgb(55, 83, 109)'
-            ))
-            
-            fig_comp.add_trace(go.Bar(
-                name=player2,
-                x=comp_df["Game"],
-                y=comp_df[player2],
-                marker_color='rgb(26, 118, 255)'
-            ))
-            
-            fig_comp.update_layout(
-                title=f"Average Scores: {player1} vs {player2}",
-                xaxis_title="Game",
-                yaxis_title="Average Score",
-                barmode='group',
-                template="plotly_white"
-            )
-            
-            st.plotly_chart(fig_comp, use_container_width=True)
+        # One pandas reshape instead of a per-game dict build; dropna
+        # keeps only games both players have an average for
+        avg_df = pd.DataFrame(stats["average_scores_by_game"])
+        comp_df = avg_df.reindex([player1, player2]).T.dropna()
+        comp_df["Difference"] = comp_df[player1] - comp_df[player2]
+        comp_df = comp_df.rename_axis("Game").reset_index()
+
+        if not comp_df.empty:
+
+            # Comparison bar chart (cached builder)
+            st.plotly_chart(
+                _build_h2h_bar_fig(player1, player2, tuple(comp_df["Game"]),
+                                   tuple(comp_df[player1]), tuple(comp_df[player2])),
+                use_container_width=True)
             
             # Comparison table
             st.dataframe(comp_df.round(2), use_container_width=True)
             
-            # Who's better at each game
+            # Who's better at each game - built as one markdown block so
+            # Streamlit sends a single element instead of one per game,
+            # iterating the columns directly rather than via iterrows
             st.subheader("🏆 Game Advantages")
-            for _, row in comp_df.iterrows():
-                game = row["Game"]
-                diff = row["Difference"]
+            lines = []
+            for game, diff in zip(comp_df["Game"].values, comp_df["Difference"].values):
                 if abs(diff) < 0.1:
-                    st.write(f"**{game}**: Very close! ({abs(diff):.2f} difference)")
+                    lines.append(f"**{game}**: Very close! ({abs(diff):.2f} difference)")
                 elif diff < 0:
-                    st.write(f"**{game}**: {player2} is better by {abs(diff):.2f} points")
+                    lines.append(f"**{game}**: {player2} is better by {abs(diff):.2f} points")
                 else:
-                    st.write(f"**{game}**: {player1} is better by {diff:.2f} points")
+                    lines.append(f"**{game}**: {player1} is better by {diff:.2f} points")
+            st.markdown("\n\n".join(lines))
     
     # Performance trends comparison
     if "player_performance_trends" in stats:
@@ -267,35 +326,13 @@ def show_head_to_head(player1, player2, df, winners_df, stats):
             
             p1_trend = stats["player_performance_trends"][player1]
             p2_trend = stats["player_performance_trends"][player2]
-            
-            fig_trends = go.Figure()
-            
-            if p1_trend["dates"]:
-                fig_trends.add_trace(go.Scatter(
-                    x=p1_trend["dates"],
-                    y=p1_trend["scores"],
-                    mode='lines+markers',
-                    name=player1,
-                    line=dict(color='rgb(55, 83, 109)', width=3)
-                ))
-            
-            if p2_trend["dates"]:
-                fig_trends.add_trace(go.Scatter(
-                    x=p2_trend["dates"],
-                    y=p2_trend["scores"],
-                    mode='lines+markers',
-                    name=player2,
-                    line=dict(color='rgb(26, 118, 255)', width=3)
-                ))
-            
-            fig_trends.update_layout(
-                title=f"Performance Trends: {player1} vs {player2}",
-                xaxis_title="Date",
-                yaxis_title="Total Weighted Score",
-                template="plotly_white"
-            )
-            
-            st.plotly_chart(fig_trends, use_container_width=True)
+
+            st.plotly_chart(
+                _build_h2h_trend_fig(
+                    player1, player2,
+                    (tuple(p1_trend["dates"]), tuple(p1_trend["scores"])),
+                    (tuple(p2_trend["dates"]), tuple(p2_trend["scores"]))),
+                use_container_width=True)
 
 if __name__ == "__main__":
     show()
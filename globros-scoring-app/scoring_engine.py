@@ -1,8 +1,60 @@
 import pandas as pd
 import numpy as np
-import math
+from functools import lru_cache
 from config import GAMES, PLAYERS
 
+# Static per-game metadata, specialized once at import time against the
+# fixed GAMES table so hot paths index arrays instead of nested dicts
+_PLAYERS = tuple(PLAYERS)
+_GAME_NAMES = list(GAMES.keys())
+_GAME_IDX = {game: i for i, game in enumerate(_GAME_NAMES)}
+_WEIGHTS = np.array([GAMES[game]["weight"] for game in _GAME_NAMES])
+_DIVISORS = np.array([100.0 if game == "Geogrid" else 1.0 for game in _GAME_NAMES])
+
+# Validation rules for the standard games: (low, high, requires_int)
+_VALIDATION = {
+    "Worldle": (1, 100, False),
+    "Globle": (1, 100, False),
+    "Countryle": (1, 100, False),
+    "Travle": (-1, 100, False),
+    "Geogrid": (0, 900, True),
+}
+
+def _list_to_nan_array(scores):
+    """
+    Lift a None-bearing score list into the engine's canonical
+    NaN-sentinel float64 array. The one boxing step at the API boundary;
+    everything behind it stays in contiguous ndarrays. np.fromiter with
+    a known count fills the array in a single traversal without the
+    intermediate list an np.array(list-comprehension) build would make.
+    """
+    return np.fromiter(
+        (np.nan if score is None else score for score in scores),
+        dtype=np.float64, count=len(scores))
+
+def _median_small(values):
+    """
+    Median of a small 1-D float array via np.partition, which places
+    just the middle order statistics instead of the full sort hiding
+    inside np.median. Worth it at roster size, where medians are taken
+    once per game per day.
+    """
+    n = values.size
+    k = n // 2
+    if n % 2:
+        return np.partition(values, k)[k]
+    part = np.partition(values, (k - 1, k))
+    return 0.5 * (part[k - 1] + part[k])
+
+@lru_cache(maxsize=256)
+def _pow04(median):
+    """
+    abs(median) ** 0.4, memoized. Medians of the small-integer games
+    repeat constantly across days, so the generic pow usually becomes a
+    dict hit.
+    """
+    return abs(median) ** 0.4
+
 def calculate_special_score(correct, guesses_or_distance, game_type):
     """
     Calculate score for NoBordle and ImpossiBordle games.
@@ -17,10 +69,26 @@ def calculate_special_score(correct, guesses_or_distance, game_type):
     """
     if correct and guesses_or_distance <= 6:
         return guesses_or_distance
-    else:
-        # S = 8*(1+sqrt(Distance/12500))
-        distance = guesses_or_distance if not correct else 0
-        return 8 * (1 + math.sqrt(distance / 12500))
+    # Defer to the batch kernel so the distance formula lives in one place
+    return float(calculate_special_scores_batch([correct], [guesses_or_distance])[0])
+
+def calculate_special_scores_batch(correct, guesses_or_distances):
+    """
+    Vectorized calculate_special_score for a whole batch of entries.
+
+    Args:
+        correct (array-like): Whether each answer was correct
+        guesses_or_distances (array-like): Guesses if correct, distance in miles if incorrect
+
+    Returns:
+        np.ndarray: Raw scores, one per entry
+    """
+    correct = np.asarray(correct, dtype=bool)
+    values = np.asarray(guesses_or_distances, dtype=float)
+    # S = 8*(1+sqrt(Distance/12500)), with distance 0 for correct answers
+    distances = np.where(correct, 0.0, values)
+    penalty = 8 * (1 + np.sqrt(distances / 12500))
+    return np.where(correct & (values <= 6), values, penalty)
 
 def calculate_normalized_score(raw_scores, game):
     """
@@ -36,41 +104,78 @@ def calculate_normalized_score(raw_scores, game):
     Returns:
         list: Normalized unweighted scores (None for non-participants)
     """
-    # Filter out None values for median calculation
-    participating_scores = [score for score in raw_scores if score is not None]
-    
-    if not participating_scores:
-        # If no one participated, return all zeros
-        return [0.0 if score is not None else None for score in raw_scores]
-    
+    normalized = _normalized_array(raw_scores, game)
+    # NaN entries map back to None for non-participants
+    return [
+        None if np.isnan(value) else float(value)
+        for value in normalized
+    ]
+
+def _normalized_array(raw_scores, game):
+    """
+    Normalization kernel behind calculate_normalized_score: returns the
+    normalized scores as a float array with NaN for non-participants, so
+    callers that keep computing (weighting, totals) can stay in NumPy.
+
+    Args:
+        raw_scores (list): List of raw scores (None for non-participants)
+        game (str): Game name
+
+    Returns:
+        np.ndarray: Normalized unweighted scores, NaN for non-participants
+    """
+    # NaN marks non-participants so the whole vector normalizes in one
+    # ufunc pass instead of a per-score Python loop
+    scores_array = _list_to_nan_array(raw_scores)
+    participating = ~np.isnan(scores_array)
+
+    if not participating.any():
+        # If no one participated, there is nothing to normalize
+        return scores_array
+
     # Apply Geogrid normalization (divide by 100) before median calculation
     if game == "Geogrid":
-        participating_scores = [score / 100.0 for score in participating_scores]
-    
-    scores_array = np.array(participating_scores, dtype=float)
-    median_score = np.median(scores_array)
-    
-    normalized_scores = []
-    for score in raw_scores:
-        if score is None:
-            normalized_scores.append(None)  # Non-participant
-        else:
-            try:
-                # Apply Geogrid normalization to individual scores as well
-                actual_score = score / 100.0 if game == "Geogrid" else float(score)
-                
-                # Handle division by zero case when median is exactly 0
-                if median_score == 0:
-                    # When median is 0, scores above 0 are positive, scores below 0 are negative
-                    normalized = actual_score  # Simple difference since median is 0
-                else:
-                    # Use absolute value for the denominator to handle negative medians properly
-                    normalized = (actual_score - median_score) / (abs(median_score) ** 0.4)
-                normalized_scores.append(normalized)
-            except (ValueError, TypeError):
-                normalized_scores.append(0.0)
-    
-    return normalized_scores
+        scores_array = scores_array / 100.0
+
+    # Partition-select the median of the participant values; cheaper
+    # than the generic nanmedian machinery at roster size
+    median_score = _median_small(scores_array[participating])
+
+    if median_score == 0:
+        # When median is 0, scores above 0 are positive, scores below 0 are negative
+        return scores_array  # Simple difference since median is 0
+    # Use absolute value for the denominator to handle negative medians properly
+    return (scores_array - median_score) / _pow04(float(median_score))
+
+def _normalize_matrix(raw_matrix):
+    """
+    Row-wise normalization for a whole day in one matrix pass.
+
+    Rows are games (Geogrid already on its /100 scale), columns are
+    players, NaN marks non-participants. Each row is normalized against
+    its participant median with the same zero-median and abs-median**0.4
+    rules as _normalized_array, so a day's breakdowns and totals all
+    come out of a single kernel instead of per-game Python loops.
+
+    Args:
+        raw_matrix (np.ndarray): (n_games, n_players) raw scores, NaN for non-participants
+
+    Returns:
+        np.ndarray: Normalized unweighted scores, NaN for non-participants
+    """
+    n_games = raw_matrix.shape[0]
+    if n_games == 0:
+        return raw_matrix.copy()
+
+    # Row medians over participants only; rows nobody played stay NaN
+    medians = np.full((n_games, 1), np.nan)
+    has_players = ~np.isnan(raw_matrix).all(axis=1)
+    if has_players.any():
+        medians[has_players, 0] = np.nanmedian(raw_matrix[has_players], axis=1)
+
+    # Zero-median rows keep the plain difference (divide by 1)
+    denoms = np.where(medians == 0, 1.0, np.abs(medians) ** 0.4)
+    return (raw_matrix - medians) / denoms
 
 def calculate_weighted_scores(normalized_scores, game):
     """
@@ -83,69 +188,88 @@ def calculate_weighted_scores(normalized_scores, game):
     Returns:
         list: Weighted scores (None for non-participants)
     """
-    weight = GAMES[game]["weight"]
-    return [score * weight if score is not None else None for score in normalized_scores]
+    weight = _WEIGHTS[_GAME_IDX[game]]
+    # One broadcast multiply over the NaN-sentinel array instead of a
+    # per-player Python multiply with a None branch
+    weighted = _list_to_nan_array(normalized_scores) * weight
+    return [None if np.isnan(value) else float(value) for value in weighted]
 
-def calculate_daily_results(scores_data):
+def calculate_daily_results(scores_data, return_details=True):
     """
     Calculate complete daily results including rankings.
-    
+
     Args:
         scores_data (dict): Dictionary with game names as keys and lists of scores as values
                            Format: {"Worldle": [score1, score2, ...], "Globle": [...], ...}
-    
+        return_details (bool): When False, skip the per-game breakdown dicts
+                               and fill in only totals, rankings and winners -
+                               enough for callers that just need the outcome
+
     Returns:
         dict: Complete results with individual scores, totals, and rankings
     """
+    # The roster is program-lifetime data, so every result shares the
+    # one immutable tuple instead of copying the list per call; the
+    # totals list is filled from the matrix pass below
     results = {
-        "players": PLAYERS.copy(),
+        "players": _PLAYERS,
         "raw_scores": {},
         "normalized_unweighted": {},
         "normalized_weighted": {},
-        "total_scores": [0] * len(PLAYERS),
+        "total_scores": [],
         "rankings": []
     }
-    
-    # Process each game
-    for game, raw_scores in scores_data.items():
-        if game not in GAMES:
-            continue
-            
-        # Store raw scores
-        results["raw_scores"][game] = raw_scores
-        
-        # Calculate normalized unweighted scores
-        normalized_unweighted = calculate_normalized_score(raw_scores, game)
-        results["normalized_unweighted"][game] = normalized_unweighted
-        
-        # Calculate weighted scores
-        weighted_scores = calculate_weighted_scores(normalized_unweighted, game)
-        results["normalized_weighted"][game] = weighted_scores
-        
-        # Add to total scores (only for participating players)
-        for i, weighted_score in enumerate(weighted_scores):
-            if weighted_score is not None:
-                results["total_scores"][i] += weighted_score
-    
-    # Filter out non-participating players for rankings
-    participating_player_totals = []
-    for i, player in enumerate(PLAYERS):
-        # Check if player participated in any game
-        participated = any(
-            results["raw_scores"][game][i] is not None 
-            for game in results["raw_scores"]
-        )
-        if participated:
-            participating_player_totals.append((player, results["total_scores"][i]))
-    
-    # Calculate rankings (lower total score is better) - only participating players
-    participating_player_totals.sort(key=lambda x: x[1])
-    results["rankings"] = participating_player_totals
-    
-    # Handle ties - find all players with the lowest score among participants
-    if participating_player_totals:
-        lowest_score = participating_player_totals[0][1]
-        winners = [player for player, score in participating_player_totals if score == lowest_score]
+
+    # Stack the day into a (n_games, n_players) matrix once so the
+    # totals come out of a single matrix kernel instead of a running
+    # per-game accumulation
+    game_names = [game for game in scores_data if game in GAMES]
+    raw_matrix = np.array(
+        [_list_to_nan_array(scores_data[game]) for game in game_names],
+        dtype=float).reshape(len(game_names), len(PLAYERS))
+    game_idx = np.array([_GAME_IDX[game] for game in game_names], dtype=int)
+    raw_matrix /= _DIVISORS[game_idx][:, None]
+    weights = _WEIGHTS[game_idx]
+
+    # Normalize, weight and total the whole day in fused matrix
+    # operations; the per-game rows below are just views of these
+    normalized_matrix = _normalize_matrix(raw_matrix)
+    weighted_matrix = normalized_matrix * weights[:, None]
+    totals = np.nansum(weighted_matrix, axis=0)
+    results["total_scores"] = totals.tolist()
+
+    # A player participated if any game row holds a real score for them -
+    # one reduction down the game axis instead of a per-player any() scan
+    # over the raw-score dicts
+    participated = ~np.isnan(raw_matrix).all(axis=0)
+
+    if return_details:
+        # Per-game breakdowns, unboxed to None-bearing lists for storage
+        for row, game in enumerate(game_names):
+            results["raw_scores"][game] = scores_data[game]
+
+            participating = ~np.isnan(normalized_matrix[row])
+            results["normalized_unweighted"][game] = [
+                float(value) if keep else None
+                for value, keep in zip(normalized_matrix[row], participating)
+            ]
+            results["normalized_weighted"][game] = [
+                float(value) if keep else None
+                for value, keep in zip(weighted_matrix[row], participating)
+            ]
+
+    # Rankings (lower total score is better) for participating players
+    # only: one stable argsort over the totals vector, and tie handling
+    # as an equality sweep against the lowest total
+    part_idx = np.flatnonzero(participated)
+    order = part_idx[np.argsort(totals[part_idx], kind="stable")]
+    results["rankings"] = [(PLAYERS[i], float(totals[i])) for i in order]
+
+    # Winners come from a plain min + equality sweep, independent of the
+    # sort; ties keep roster order, as the stable sort produced before
+    if part_idx.size:
+        lowest_score = totals[part_idx].min()
+        winners = [PLAYERS[i] for i in part_idx if totals[i] == lowest_score]
     else:
         winners = []
     
@@ -160,6 +284,41 @@ def calculate_daily_results(scores_data):
     
     return results
 
+def calculate_many_days(df):
+    """
+    Normalize and weight a whole season of raw scores in one pass.
+
+    Vectorized sibling of calculate_daily_results for batch
+    recomputation: instead of running the daily pipeline once per date,
+    the season is pivoted to a (date, game) x player table and every row
+    is normalized against its participant median simultaneously, with
+    the same Geogrid /100, zero-median and abs-median**0.4 rules.
+
+    Args:
+        df (pd.DataFrame): Tidy frame with date, game, player and raw_score columns
+
+    Returns:
+        pd.DataFrame: One row per participating (date, game, player) with
+                      raw, normalized unweighted and normalized weighted scores
+    """
+    pivot = df.pivot_table(index=["date", "game"], columns="player",
+                           values="raw_score", observed=True)
+    games = pivot.index.get_level_values("game")
+
+    scaled = pivot.div(np.where(games == "Geogrid", 100.0, 1.0), axis=0)
+    medians = scaled.median(axis=1)
+    # Zero-median rows keep the plain difference (divide by 1)
+    denoms = medians.abs().pow(0.4).where(medians != 0, 1.0)
+    normalized = scaled.sub(medians, axis=0).div(denoms, axis=0)
+    weighted = normalized.mul(_WEIGHTS[[_GAME_IDX[game] for game in games]], axis=0)
+
+    # Back to tidy form, dropping the NaN cells so non-participants fall
+    # out just like the None rows the daily pipeline skips
+    out = pivot.stack().rename("raw_score").reset_index()
+    out["normalized_unweighted_score"] = normalized.stack().values
+    out["normalized_weighted_score"] = weighted.stack().values
+    return out.dropna(subset=["raw_score"]).reset_index(drop=True)
+
 def format_results_for_display(results):
     """
     Format results for nice display in Streamlit.
@@ -173,15 +332,19 @@ def format_results_for_display(results):
     output = []
     output.append("## 🌍 Daily Geography Game Results 🌍\n")
     
-    # Individual game scores
+    # Individual game scores - hoist each game's three lists out of the
+    # player loop and zip them instead of re-indexing the dicts per row
     for game in GAMES.keys():
         if game in results["raw_scores"]:
             output.append(f"### {game}")
-            for i, player in enumerate(results["players"]):
-                raw = results["raw_scores"][game][i]
-                normalized = results["normalized_unweighted"][game][i]
-                weighted = results["normalized_weighted"][game][i]
-                output.append(f"- **{player}**: {raw} (normalized: {normalized:.3f}, weighted: {weighted:.3f})")
+            raws = results["raw_scores"][game]
+            norms = results["normalized_unweighted"][game]
+            weights = results["normalized_weighted"][game]
+            output.extend(
+                f"- **{player}**: {raw} (normalized: {normalized:.3f}, weighted: {weighted:.3f})"
+                for player, raw, normalized, weighted
+                in zip(results["players"], raws, norms, weights)
+            )
             output.append("")
     
     # Total scores and rankings
@@ -211,15 +374,15 @@ def validate_score_input(game, score, correct=None):
         # Special validation for NoBordle/ImpossiBordle handled in UI
         return True, ""
     
-    # Standard game validation
-    if game in ["Worldle", "Globle", "Countryle"]:
-        if not isinstance(score, (int, float)) or score < 1 or score > 100:
-            return False, f"{game} score must be between 1 and 100"
-    elif game == "Travle":
-        if not isinstance(score, (int, float)) or score < -1 or score > 100:
-            return False, f"{game} score must be between -1 and 100"
-    elif game == "Geogrid":
-        if not isinstance(score, int) or score < 0 or score > 900:
-            return False, f"{game} score must be an integer between 0 and 900"
-    
+    # Standard game validation: one table lookup instead of a chain of
+    # membership tests
+    rule = _VALIDATION.get(game)
+    if rule is not None:
+        low, high, requires_int = rule
+        if requires_int:
+            if not isinstance(score, int) or score < low or score > high:
+                return False, f"{game} score must be an integer between {low} and {high}"
+        elif not isinstance(score, (int, float)) or score < low or score > high:
+            return False, f"{game} score must be between {low} and {high}"
+
     return True, ""
@@ -11,8 +11,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for Earth/Globe theme
-st.markdown("""
+# Custom CSS for Earth/Globe theme plus the main header, emitted as a
+# single markdown element so each rerun sends one delta instead of two
+_PAGE_CHROME = """
 <style>
     .main-header {
         background: linear-gradient(90deg, #1f77b4, #2ca02c);
@@ -59,10 +60,10 @@ st.markdown("""
         background-color: #f0f8ff;
     }
 </style>
-""", unsafe_allow_html=True)
+<div class="main-header"><h1>🌍 Globros Geography Game Scorer 🌍</h1><p>Track your daily geography game performance</p></div>
+"""
 
-# Main header
-st.markdown('<div class="main-header"><h1>🌍 Globros Geography Game Scorer 🌍</h1><p>Track your daily geography game performance</p></div>', unsafe_allow_html=True)
+st.markdown(_PAGE_CHROME, unsafe_allow_html=True)
 
 # Sidebar navigation
 st.sidebar.title("🗺️ Navigation")
@@ -71,16 +72,17 @@ page = st.sidebar.selectbox(
     ["Daily Score Submission", "Historical Records", "Player Statistics"]
 )
 
-# Import page modules
-if page == "Daily Score Submission":
-    from pages import daily_submission
-    daily_submission.show()
-elif page == "Historical Records":
-    from pages import historical_view
-    historical_view.show()
-elif page == "Player Statistics":
-    from pages import player_stats
-    player_stats.show()
+# Page dispatch table - the modules are imported once (later reruns hit
+# sys.modules) and each rerun resolves the page with one dict lookup
+from pages import daily_submission, historical_view, player_stats
+
+_PAGES = {
+    "Daily Score Submission": daily_submission.show,
+    "Historical Records": historical_view.show,
+    "Player Statistics": player_stats.show,
+}
+
+_PAGES[page]()
 
 # Footer
 st.sidebar.markdown("---")